@@ -11,10 +11,12 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import logging
+import math
 from collections import defaultdict
+from functools import partial
 from typing import Optional, Dict, List
 
-import numpy as np
+from sortedcontainers import SortedList
 
 from syne_tune.backend.trial_status import Trial
 from syne_tune.optimizer.scheduler import (
@@ -22,6 +24,11 @@ from syne_tune.optimizer.scheduler import (
     SchedulerDecision,
     TrialSuggestion,
 )
+from syne_tune.optimizer.schedulers.utils.quantile_estimator import (
+    P2QuantileEstimator,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class MedianStoppingRule(TrialScheduler):
@@ -56,6 +63,23 @@ class MedianStoppingRule(TrialScheduler):
         ``grace_population`` have been observed at a resource level. Defaults to 5
     :param rank_cutoff: Results whose quantiles are below this level are
         discarded. Defaults to 0.5 (median)
+    :param resource_granularity: If given, values of ``resource_attr`` are
+        rounded to the closest multiple of this amount before results are
+        grouped by time-step. Use this if the resource is reported as a float
+        with noisy fractional values (e.g., fractional epochs). The grace time
+        is compared against the unrounded value. Defaults to ``None`` (no
+        rounding)
+    :param approximate_quantiles: If ``True``, results at each time-step are
+        not stored. Instead, the ``rank_cutoff`` quantile is estimated online
+        by :class:`~syne_tune.optimizer.schedulers.utils.quantile_estimator.P2QuantileEstimator`,
+        which needs constant time and memory per time-step, and a result is
+        stopped if it is worse than this estimate. For the first five
+        results at a time-step, decisions are the same as for
+        ``approximate_quantiles=False``, afterwards they are approximate.
+        Use this for very large numbers of trials. In this case,
+        ``rank_cutoff`` must lie in :math:`(0, 1)`. Non-finite results are
+        not passed to the estimator, and NaN results are stopped once the
+        grace conditions no longer apply. Defaults to ``False``
     """
 
     def __init__(
@@ -67,72 +91,139 @@ class MedianStoppingRule(TrialScheduler):
         grace_time: Optional[int] = 1,
         grace_population: int = 5,
         rank_cutoff: float = 0.5,
+        resource_granularity: Optional[float] = None,
+        approximate_quantiles: bool = False,
     ):
         super(MedianStoppingRule, self).__init__(config_space=scheduler.config_space)
         if metric is None and hasattr(scheduler, "metric"):
             metric = getattr(scheduler, "metric")
         self.metric = metric
-        self.sorted_results = defaultdict(list)
+        self.approximate_quantiles = approximate_quantiles
+        if approximate_quantiles:
+            assert (
+                0 < rank_cutoff < 1
+            ), f"rank_cutoff = {rank_cutoff} must lie in (0, 1) if approximate_quantiles = True"
+            self.sorted_results = defaultdict(
+                partial(P2QuantileEstimator, prob=rank_cutoff)
+            )
+        else:
+            # ``SortedList`` supports insertion and rank queries in :math:`O(log n)`
+            self.sorted_results = defaultdict(SortedList)
         self.scheduler = scheduler
         self.resource_attr = resource_attr
         self.rank_cutoff = rank_cutoff
         self.grace_time = grace_time
         self.min_samples_required = grace_population
         self.running_average = running_average
+        assert (
+            resource_granularity is None or resource_granularity > 0
+        ), f"resource_granularity = {resource_granularity} must be positive"
+        self.resource_granularity = resource_granularity
         if running_average:
-            self.trial_to_results = defaultdict(list)
+            # Maps trial_id to ``[count, sum]`` of its observations so far
+            self.trial_to_running_sum = defaultdict(lambda: [0, 0.0])
+        # Metric names and mode do not change, so they are fetched only once
+        self._metric_names = tuple(scheduler.metric_names())
         self.mode = scheduler.metric_mode()
+        # Results are stored such that smaller is better
+        self._sign = -1.0 if self.mode == "max" else 1.0
 
     def _suggest(self, trial_id: int) -> Optional[TrialSuggestion]:
         return self.scheduler._suggest(trial_id=trial_id)
 
     def on_trial_result(self, trial: Trial, result: Dict) -> str:
-        new_metric = result[self.metric]
-        if self.mode == "max":
-            new_metric *= -1
+        # Casting to ``float`` avoids NumPy scalars ending up in the
+        # bookkeeping, which makes all comparisons and sums slower
+        new_metric = float(result[self.metric]) * self._sign
         time_step = result[self.resource_attr]
 
         if self.running_average:
             # gets the running average of current observations
-            self.trial_to_results[trial.trial_id].append(new_metric)
-            new_metric = np.mean(self.trial_to_results[trial.trial_id])
+            running_sum = self.trial_to_running_sum[trial.trial_id]
+            running_sum[0] += 1
+            running_sum[1] += new_metric
+            new_metric = running_sum[1] / running_sum[0]
+        if math.isnan(new_metric):
+            # NaN results (e.g., of diverged trials) rank worst. Comparisons
+            # with NaN are always false, so they must not be inserted as is
+            new_metric = math.inf
 
         # insert new metric in sorted results acquired at this resource
-        index = np.searchsorted(self.sorted_results[time_step], new_metric)
-        self.sorted_results[time_step] = np.insert(
-            self.sorted_results[time_step], index, new_metric
-        )
-        normalized_rank = index / float(len(self.sorted_results[time_step]))
-
-        if (
-            self.grace_condition(time_step=time_step)
-            or normalized_rank <= self.rank_cutoff
-        ):
-            return self.scheduler.on_trial_result(trial=trial, result=result)
+        sorted_results = self.sorted_results[self._time_step_key(time_step)]
+        if self.approximate_quantiles:
+            if math.isfinite(new_metric):
+                sorted_results.add(new_metric)
+                cutoff_value = sorted_results.quantile()
+                within_cutoff = new_metric <= cutoff_value
+            else:
+                # Non-finite values would corrupt the estimator, so they are
+                # not added. ``inf`` (NaN is mapped to it above) ranks worst,
+                # ``-inf`` ranks best
+                cutoff_value = None
+                within_cutoff = new_metric < 0
         else:
-            logging.info(
-                f"see new results {new_metric} at time-step {time_step} for trial {trial.trial_id}"
-                f" with rank {int(normalized_rank * 100)}%, "
-                f"stopping it as it does not rank on the top {int(self.rank_cutoff * 100)}%"
-            )
+            index = sorted_results.bisect_left(new_metric)
+            sorted_results.add(new_metric)
+            normalized_rank = index / float(len(sorted_results))
+            within_cutoff = normalized_rank <= self.rank_cutoff
+
+        if self.grace_condition(time_step=time_step) or within_cutoff:
+            decision = self.scheduler.on_trial_result(trial=trial, result=result)
+            if decision == SchedulerDecision.STOP:
+                self._remove_running_sum(trial.trial_id)
+            return decision
+        else:
+            if logger.isEnabledFor(logging.INFO):
+                if self.approximate_quantiles:
+                    if cutoff_value is None:
+                        rank_str = "with non-finite value"
+                    else:
+                        rank_str = f"above estimated cutoff value {cutoff_value}"
+                else:
+                    rank_str = f"with rank {int(normalized_rank * 100)}%"
+                logger.info(
+                    f"see new results {new_metric} at time-step {time_step} for trial {trial.trial_id}"
+                    f" {rank_str}, "
+                    f"stopping it as it does not rank on the top {int(self.rank_cutoff * 100)}%"
+                )
+            self._remove_running_sum(trial.trial_id)
             return SchedulerDecision.STOP
 
+    def _remove_running_sum(self, trial_id: int):
+        # Running sums are not needed anymore once a trial is finished. Note
+        # that they are kept if the trial is paused, since it may be resumed
+        if self.running_average:
+            self.trial_to_running_sum.pop(trial_id, None)
+
+    def on_trial_complete(self, trial: Trial, result: Dict):
+        self._remove_running_sum(trial.trial_id)
+
+    def on_trial_error(self, trial: Trial):
+        self._remove_running_sum(trial.trial_id)
+
     def grace_condition(self, time_step: float) -> bool:
         """
         :param time_step: Value :code:`result[self.resource_attr]`
         :return: Decide for continue?
         """
-        if (
-            self.min_samples_required is not None
-            and len(self.sorted_results[time_step]) < self.min_samples_required
-        ):
-            return True
+        if self.min_samples_required is not None:
+            # Use ``get`` in order not to create an empty entry for ``time_step``
+            sorted_results = self.sorted_results.get(self._time_step_key(time_step))
+            num_samples = 0 if sorted_results is None else len(sorted_results)
+            if num_samples < self.min_samples_required:
+                return True
         if self.grace_time is not None and time_step < self.grace_time:
             return True
         return False
 
+    def _time_step_key(self, time_step: float) -> float:
+        if self.resource_granularity is None:
+            return time_step
+        granularity = self.resource_granularity
+        return round(time_step / granularity) * granularity
+
     def metric_names(self) -> List[str]:
-        return self.scheduler.metric_names()
+        return list(self._metric_names)
 
     def metric_mode(self) -> str:
-        return self.scheduler.metric_mode()
+        return self.mode
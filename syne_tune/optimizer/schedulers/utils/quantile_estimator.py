@@ -0,0 +1,126 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import math
+from typing import List
+
+_NUM_MARKERS = 5
+
+
+class P2QuantileEstimator:
+    """
+    Online estimator of a single quantile of a stream of values, using the
+    P² algorithm. Both :meth:`add` and :meth:`quantile` run in constant time,
+    and memory does not grow with the number of values. Until five values
+    have been observed, the quantile is exact (see :meth:`quantile`),
+    afterwards it is an approximation.
+
+    Reference:
+
+        | The P² Algorithm for Dynamic Calculation of Quantiles and Histograms
+        | Without Storing Observations.
+        | Jain, R. and Chlamtac, I. 1985.
+        | Communications of the ACM, 28(10), 1076–1085
+
+    :param prob: Probability level of the quantile to be estimated, in
+        :math:`(0, 1)`
+    """
+
+    def __init__(self, prob: float):
+        assert 0 < prob < 1, f"prob = {prob} must lie in (0, 1)"
+        self.prob = prob
+        self._count = 0
+        # Marker heights. Until ``_NUM_MARKERS`` values have been observed,
+        # these are the (sorted) values themselves
+        self._heights: List[float] = []
+        self._positions = list(range(_NUM_MARKERS))
+        self._desired_positions = [
+            0.0,
+            2 * prob,
+            4 * prob,
+            2 + 2 * prob,
+            4.0,
+        ]
+        self._increments = [0.0, prob / 2, prob, (1 + prob) / 2, 1.0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, value: float):
+        """
+        :param value: New value of the stream. Must be finite
+        """
+        assert math.isfinite(value), f"value = {value} must be finite"
+        self._count += 1
+        heights = self._heights
+        if self._count <= _NUM_MARKERS:
+            heights.append(value)
+            heights.sort()
+            return
+        # Find cell ``k`` containing ``value``, adjusting extreme markers
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[-1]:
+            heights[-1] = value
+            k = _NUM_MARKERS - 2
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+        positions = self._positions
+        for i in range(k + 1, _NUM_MARKERS):
+            positions[i] += 1
+        for i in range(_NUM_MARKERS):
+            self._desired_positions[i] += self._increments[i]
+        # Adjust heights of the middle markers if necessary
+        for i in range(1, _NUM_MARKERS - 1):
+            delta = self._desired_positions[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (
+                delta <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                sign = 1 if delta > 0 else -1
+                height = self._parabolic(i, sign)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, sign)
+                heights[i] = height
+                positions[i] += sign
+
+    def _parabolic(self, i: int, sign: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + sign / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + sign) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - sign) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, sign: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + sign * (q[i + sign] - q[i]) / (n[i + sign] - n[i])
+
+    def quantile(self) -> float:
+        """
+        :return: Current estimate of the quantile at level ``prob``
+        """
+        assert self._count > 0, "No values have been observed yet"
+        if self._count <= _NUM_MARKERS:
+            # Largest value whose normalized rank ``index / count`` is at most
+            # ``prob``. For ``value`` among the observed ones,
+            # ``value <= quantile()`` holds iff
+            # ``bisect_left(values, value) / count <= prob``
+            count = self._count
+            index = min(int(self.prob * count), count - 1)
+            while index + 1 < count and (index + 1) / count <= self.prob:
+                index += 1
+            while index > 0 and index / count > self.prob:
+                index -= 1
+            return self._heights[index]
+        return self._heights[2]
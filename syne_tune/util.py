@@ -11,16 +11,18 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import json
+import logging
 import os
 import re
 import string
 import random
 import time
-from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Union, Dict, Any, Iterable
+from typing import Optional, List, Union, Dict, Any, Iterable, Tuple
 from time import perf_counter
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 
 import numpy as np
 
@@ -32,6 +34,8 @@ try:
 except ImportError:
     print(try_import_aws_message())
 
+logger = logging.getLogger(__name__)
+
 
 class RegularCallback:
     """
@@ -42,17 +46,33 @@ class RegularCallback:
     """
 
     def __init__(self, callback: callable, call_seconds_frequency: float):
-        self.time_last_recent_call = datetime.now()
+        self.time_last_recent_call = perf_counter()
         self.frequency = call_seconds_frequency
         self.callback = callback
 
     def __call__(self, *args, **kwargs):
-        seconds_since_last_call = (datetime.now() - self.time_last_recent_call).seconds
-        if seconds_since_last_call > self.frequency:
-            self.time_last_recent_call = datetime.now()
+        now = perf_counter()
+        if now - self.time_last_recent_call > self.frequency:
+            self.time_last_recent_call = now
             self.callback(*args, **kwargs)
 
 
+@lru_cache(maxsize=8)
+def _local_root_path(env_folder: Optional[str]) -> Path:
+    # Keyed by the value of ``SYNETUNE_FOLDER``, so that changes of the
+    # environment variable at runtime are still picked up
+    if env_folder is not None:
+        return Path(env_folder).expanduser()
+    return Path(f"~/{SYNE_TUNE_DEFAULT_FOLDER}").expanduser()
+
+
+@lru_cache(maxsize=1)
+def _default_s3_bucket() -> str:
+    # Creating a SageMaker session is expensive and may require network
+    # access, so the default bucket is determined only once
+    return sagemaker.Session().default_bucket()
+
+
 def experiment_path(
     tuner_name: Optional[str] = None, local_path: Optional[str] = None
 ) -> Path:
@@ -78,10 +98,7 @@ def experiment_path(
     else:
         # means we are running on a local machine, we store results in a local path
         if local_path is None:
-            if SYNE_TUNE_ENV_FOLDER in os.environ:
-                result_path = Path(os.environ[SYNE_TUNE_ENV_FOLDER]).expanduser()
-            else:
-                result_path = Path(f"~/{SYNE_TUNE_DEFAULT_FOLDER}").expanduser()
+            result_path = _local_root_path(os.environ.get(SYNE_TUNE_ENV_FOLDER))
         else:
             result_path = Path(local_path)
     if tuner_name is not None:
@@ -97,13 +114,13 @@ def s3_experiment_path(
     """Returns S3 path for storing results and checkpoints.
 
     :param s3_bucket: If not given, the default bucket for the SageMaker
-        session is used
+        session is used. It is determined once and cached afterwards
     :param experiment_name: If given, this is used as first directory
     :param tuner_name: If given, this is used as second directory
     :return: S3 path, ending on "/"
     """
     if s3_bucket is None:
-        s3_bucket = sagemaker.Session().default_bucket()
+        s3_bucket = _default_s3_bucket()
     s3_path = f"s3://{s3_bucket}/{SYNE_TUNE_DEFAULT_FOLDER}/"
     for part in (experiment_name, tuner_name):
         if part is not None:
@@ -111,8 +128,11 @@ def s3_experiment_path(
     return s3_path
 
 
+_SAGEMAKER_NAME_PATTERN = re.compile("^[a-zA-Z0-9](-*[a-zA-Z0-9]){0,62}$")
+
+
 def check_valid_sagemaker_name(name: str):
-    assert re.compile("^[a-zA-Z0-9](-*[a-zA-Z0-9]){0,62}$").match(
+    assert _SAGEMAKER_NAME_PATTERN.match(
         name
     ), f"{name} should consists in alpha-digits possibly separated by character -"
 
@@ -123,6 +143,17 @@ def sanitize_sagemaker_name(name: str) -> str:
     return new_name
 
 
+def _base_and_timestamp(base: Optional[str], default: str) -> Tuple[str, str]:
+    if base is None:
+        base = default
+    check_valid_sagemaker_name(base)
+    moment_secs, moment_ns = divmod(time.time_ns(), 1_000_000_000)
+    timestamp = time.strftime(
+        "%Y-%m-%d-%H-%M-%S", time.gmtime(moment_secs)
+    ) + "-{:03d}".format(moment_ns // 1_000_000)
+    return base, timestamp
+
+
 def name_from_base(base: Optional[str], default: str, max_length: int = 63) -> str:
     """Append a timestamp to the provided string.
 
@@ -135,33 +166,51 @@ def name_from_base(base: Optional[str], default: str, max_length: int = 63) -> s
     :param max_length: Maximum length for the resulting string (default: 63)
     :return: Input parameter with appended timestamp
     """
-    if base is None:
-        check_valid_sagemaker_name(default)
-        base = default
-    else:
-        check_valid_sagemaker_name(base)
-
-    moment = time.time()
-    moment_ms = repr(moment).split(".")[1][:3]
-    timestamp = time.strftime(
-        "%Y-%m-%d-%H-%M-%S-{}".format(moment_ms), time.gmtime(moment)
-    )
+    base, timestamp = _base_and_timestamp(base, default)
     trimmed_base = base[: max_length - len(timestamp) - 1]
     return "{}-{}".format(trimmed_base, timestamp)
 
 
+def name_batch_from_base(
+    base: Optional[str], default: str, num_names: int, max_length: int = 63
+) -> List[str]:
+    """Generates ``num_names`` distinct names at once.
+
+    Same as :func:`name_from_base`, but the timestamp is computed only once
+    and an index ``0, 1, ...`` is appended to make the names distinct. This
+    is cheaper than calling :func:`name_from_base` repeatedly, which also
+    does not guarantee distinct names if called within the same millisecond.
+
+    :param base: String used as prefix to generate the unique names
+    :param default: String used if :code:`base is None`
+    :param num_names: Number of names to generate
+    :param max_length: Maximum length for the resulting strings (default: 63)
+    :return: List of input parameter with appended timestamp and index
+    """
+    base, timestamp = _base_and_timestamp(base, default)
+    max_index_length = len(str(max(num_names - 1, 0)))
+    trimmed_base = base[: max_length - len(timestamp) - max_index_length - 2]
+    return [
+        "{}-{}-{}".format(trimmed_base, timestamp, index) for index in range(num_names)
+    ]
+
+
+_RANDOM_STRING_POOL = string.ascii_letters + string.digits
+
+
 def random_string(length: int) -> str:
-    pool = string.ascii_letters + string.digits
-    return "".join(random.choice(pool) for _ in range(length))
+    return "".join(random.choices(_RANDOM_STRING_POOL, k=length))
 
 
+@lru_cache(maxsize=1)
 def repository_root_path() -> Path:
     """
     :return: Returns path including ``syne_tune``, ``examples``, ``benchmarking``
     """
-    return Path(__file__).parent.parent
+    return Path(__file__).resolve().parent.parent
 
 
+@lru_cache(maxsize=1)
 def script_checkpoint_example_path() -> Path:
     """
     :return: Path of checkpoint example
@@ -177,6 +226,7 @@ def script_checkpoint_example_path() -> Path:
     return path
 
 
+@lru_cache(maxsize=1)
 def script_height_example_path() -> Path:
     """
     :return: Path of ``train_heigth`` example
@@ -193,13 +243,31 @@ def script_height_example_path() -> Path:
 
 
 @contextmanager
-def catchtime(name: str) -> float:
+def catchtime(
+    name: str, runtime_dict: Optional[Dict[str, float]] = None, verbose: bool = True
+) -> float:
+    """
+    Context manager measuring the time spent in its block. It yields a function
+    returning the time elapsed so far.
+
+    :param name: Name of the block, used in messages and as key in
+        ``runtime_dict``
+    :param runtime_dict: If given, the runtime (in secs) is written to
+        ``runtime_dict[name]``
+    :param verbose: If ``True``, the runtime is printed at the end of the block.
+        Defaults to ``True``
+    """
+    if verbose:
+        logger.info("start: %s", name)
     start = perf_counter()
     try:
-        print(f"start: {name}")
         yield lambda: perf_counter() - start
     finally:
-        print(f"Time for {name}: {perf_counter() - start:.4f} secs")
+        runtime = perf_counter() - start
+        if runtime_dict is not None:
+            runtime_dict[name] = runtime
+        if verbose:
+            print(f"Time for {name}: {runtime:.4f} secs")
 
 
 def is_increasing(lst: List[Union[float, int]]) -> bool:
@@ -207,7 +275,7 @@ def is_increasing(lst: List[Union[float, int]]) -> bool:
     :param lst: List of float or int entries
     :return: Is ``lst`` strictly increasing?
     """
-    return all(x < y for x, y in zip(lst, lst[1:]))
+    return all(x < y for x, y in zip(lst, islice(lst, 1, None)))
 
 
 def is_positive_integer(lst: List[int]) -> bool:
@@ -215,7 +283,8 @@ def is_positive_integer(lst: List[int]) -> bool:
     :param lst: List of int entries
     :return: Are all entries of ``lst`` of type ``int`` and positive?
     """
-    return all(x == int(x) and x >= 1 for x in lst)
+    # Plain ``int`` entries (the common case) skip the conversion
+    return all((isinstance(x, int) or x == int(x)) and x >= 1 for x in lst)
 
 
 def dump_json_with_numpy(
@@ -0,0 +1,239 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from syne_tune.backend.trial_status import Trial
+from syne_tune.config_space import uniform
+from syne_tune.optimizer.scheduler import SchedulerDecision
+from syne_tune.optimizer.schedulers import FIFOScheduler, MedianStoppingRule
+from syne_tune.optimizer.schedulers.utils.quantile_estimator import (
+    P2QuantileEstimator,
+)
+
+
+def _make_rule(mode: str, **kwargs) -> MedianStoppingRule:
+    config_space = {"x": uniform(0, 1)}
+    return MedianStoppingRule(
+        scheduler=FIFOScheduler(
+            config_space, searcher="random", metric="metric", mode=mode
+        ),
+        resource_attr="epoch",
+        **kwargs,
+    )
+
+
+def _trial(trial_id: int) -> Trial:
+    return Trial(trial_id=trial_id, config={"x": 0.5}, creation_time=datetime.now())
+
+
+@pytest.mark.parametrize("mode", ["min", "max"])
+def test_median_stopping_rule_stops_bad_trials(mode):
+    sign = 1 if mode == "min" else -1
+    rule = _make_rule(mode, running_average=False, grace_population=4)
+    decisions = []
+    # Trials 0, 1, 2 fall into the grace population, trial 3 is worse than the
+    # median
+    for trial_id, value in enumerate([1.0, 2.0, 3.0, 10.0]):
+        decisions.append(
+            rule.on_trial_result(
+                trial=_trial(trial_id), result={"metric": sign * value, "epoch": 1}
+            )
+        )
+    assert decisions[:3] == [SchedulerDecision.CONTINUE] * 3
+    assert decisions[3] == SchedulerDecision.STOP
+    assert list(rule.sorted_results[1]) == [1.0, 2.0, 3.0, 10.0]
+
+
+def test_median_stopping_rule_running_average():
+    rule = _make_rule("min", running_average=True, grace_population=2)
+    trial = _trial(0)
+    for epoch, value in enumerate([1.0, 3.0, 5.0], start=1):
+        rule.on_trial_result(trial=trial, result={"metric": value, "epoch": epoch})
+    # Running averages are 1, 2, 3
+    assert [list(rule.sorted_results[epoch]) for epoch in (1, 2, 3)] == [
+        [1.0],
+        [2.0],
+        [3.0],
+    ]
+
+
+def test_nan_results_rank_worst():
+    rule = _make_rule("min", running_average=False, grace_population=3)
+    decisions = [
+        rule.on_trial_result(
+            trial=_trial(trial_id), result={"metric": value, "epoch": 1}
+        )
+        for trial_id, value in enumerate(
+            [1.0, 2.0, 3.0, float("nan"), 2.5, 2.6, float("nan")]
+        )
+    ]
+    C, S = SchedulerDecision.CONTINUE, SchedulerDecision.STOP
+    assert decisions == [C, C, S, S, C, C, S]
+    assert (
+        list(rule.sorted_results[1]) == [1.0, 2.0, 2.5, 2.6, 3.0] + [float("inf")] * 2
+    )
+
+
+def test_grace_condition_does_not_create_entries():
+    rule = _make_rule("min", grace_population=2)
+    assert rule.grace_condition(time_step=3)
+    assert 3 not in rule.sorted_results
+
+
+def test_resource_granularity_groups_noisy_time_steps():
+    rule = _make_rule("min", running_average=False, resource_granularity=1)
+    for trial_id, epoch in enumerate([2.0, 2.0001, 1.9998]):
+        rule.on_trial_result(
+            trial=_trial(trial_id), result={"metric": float(trial_id), "epoch": epoch}
+        )
+    assert list(rule.sorted_results.keys()) == [2]
+    assert list(rule.sorted_results[2]) == [0.0, 1.0, 2.0]
+
+
+def test_approximate_quantiles():
+    rule = _make_rule(
+        "min", running_average=False, grace_population=4, approximate_quantiles=True
+    )
+    decisions = [
+        rule.on_trial_result(
+            trial=_trial(trial_id), result={"metric": value, "epoch": 1}
+        )
+        for trial_id, value in enumerate([1.0, 2.0, 3.0, 10.0, 0.5])
+    ]
+    assert decisions == [SchedulerDecision.CONTINUE] * 3 + [
+        SchedulerDecision.STOP,
+        SchedulerDecision.CONTINUE,
+    ]
+    assert len(rule.sorted_results[1]) == 5
+
+
+@pytest.mark.parametrize("rank_cutoff", [0.2, 0.375, 0.5, 0.6, 0.75, 0.9])
+def test_approximate_quantiles_same_as_exact_for_few_results(rank_cutoff):
+    random_state = np.random.RandomState(2718281)
+    for _ in range(20):
+        values = random_state.randint(0, 4, size=5).astype(float)
+        all_decisions = []
+        for approximate_quantiles in [False, True]:
+            rule = _make_rule(
+                "min",
+                running_average=False,
+                grace_population=1,
+                rank_cutoff=rank_cutoff,
+                approximate_quantiles=approximate_quantiles,
+            )
+            all_decisions.append(
+                [
+                    rule.on_trial_result(
+                        trial=_trial(trial_id), result={"metric": value, "epoch": 1}
+                    )
+                    for trial_id, value in enumerate(values)
+                ]
+            )
+        assert all_decisions[0] == all_decisions[1], (values, all_decisions)
+
+
+def test_approximate_quantiles_many_results():
+    num_results = 50
+    rule = _make_rule(
+        "min", running_average=False, grace_population=1, approximate_quantiles=True
+    )
+    estimator = P2QuantileEstimator(prob=rule.rank_cutoff)
+    random_state = np.random.RandomState(1414213)
+    for trial_id, value in enumerate(random_state.normal(size=num_results)):
+        value = float(value)
+        decision = rule.on_trial_result(
+            trial=_trial(trial_id), result={"metric": value, "epoch": 1}
+        )
+        estimator.add(value)
+        expected = (
+            SchedulerDecision.CONTINUE
+            if value <= estimator.quantile()
+            else SchedulerDecision.STOP
+        )
+        assert decision == expected
+    rule_estimator = rule.sorted_results[1]
+    assert len(rule_estimator) == num_results
+    # Memory does not grow with the number of results
+    assert len(rule_estimator._heights) == 5
+
+
+def test_approximate_quantiles_nan_results():
+    rule = _make_rule(
+        "min", running_average=False, grace_population=3, approximate_quantiles=True
+    )
+    values = [1.0, float("nan"), 2.0, 3.0, float("nan"), 4.0] + list(
+        np.linspace(0.0, 5.0, 20)
+    )
+    decisions = [
+        rule.on_trial_result(
+            trial=_trial(trial_id), result={"metric": value, "epoch": 1}
+        )
+        for trial_id, value in enumerate(values)
+    ]
+    # NaN results are stopped once the grace population is reached, and are
+    # not passed to the estimator
+    assert decisions[4] == SchedulerDecision.STOP
+    estimator = rule.sorted_results[1]
+    assert len(estimator) == len(values) - 2
+    assert all(math.isfinite(height) for height in estimator._heights)
+    assert decisions[-1] == SchedulerDecision.STOP
+    assert decisions[6] == SchedulerDecision.CONTINUE
+
+
+def test_approximate_quantiles_invalid_rank_cutoff():
+    with pytest.raises(AssertionError):
+        _make_rule("min", rank_cutoff=1.0, approximate_quantiles=True)
+    # Valid for exact quantiles
+    _make_rule("min", rank_cutoff=1.0)
+
+
+def test_running_sums_are_removed_for_finished_trials():
+    rule = _make_rule("min", running_average=True, grace_population=2)
+    trials = [_trial(trial_id) for trial_id in range(4)]
+    for trial in trials:
+        rule.on_trial_result(trial=trial, result={"metric": 1.0, "epoch": 1})
+    assert set(rule.trial_to_running_sum.keys()) == {0, 1, 2, 3}
+    rule.on_trial_complete(trial=trials[0], result={"metric": 1.0, "epoch": 1})
+    rule.on_trial_error(trial=trials[1])
+    assert set(rule.trial_to_running_sum.keys()) == {2, 3}
+    # Trial 3 is within the grace population first, then stopped by the rule
+    decision = rule.on_trial_result(
+        trial=trials[3], result={"metric": 10.0, "epoch": 2}
+    )
+    assert decision == SchedulerDecision.CONTINUE
+    rule.on_trial_result(trial=trials[2], result={"metric": 1.0, "epoch": 2})
+    decision = rule.on_trial_result(
+        trial=trials[3], result={"metric": 10.0, "epoch": 2}
+    )
+    assert decision == SchedulerDecision.STOP
+    assert set(rule.trial_to_running_sum.keys()) == {2}
+
+
+def test_numpy_metrics_are_stored_as_float():
+    rule = _make_rule("max", running_average=False)
+    for trial_id in range(3):
+        rule.on_trial_result(
+            trial=_trial(trial_id),
+            result={"metric": np.float32(trial_id), "epoch": 1},
+        )
+    assert all(type(value) is float for value in rule.sorted_results[1])
+
+
+def test_metric_names_and_mode():
+    rule = _make_rule("max")
+    assert rule.metric_names() == ["metric"]
+    assert rule.metric_mode() == "max"
@@ -0,0 +1,50 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.utils.quantile_estimator import (
+    P2QuantileEstimator,
+)
+
+
+def test_exact_for_few_values():
+    estimator = P2QuantileEstimator(prob=0.5)
+    for value in [3.0, 1.0, 2.0]:
+        estimator.add(value)
+    assert len(estimator) == 3
+    assert estimator.quantile() == 2.0
+
+
+@pytest.mark.parametrize("prob", [0.1, 0.5, 0.9])
+@pytest.mark.parametrize("distribution", ["normal", "exponential", "uniform"])
+def test_close_to_empirical_quantile(prob, distribution):
+    random_state = np.random.RandomState(31415927)
+    values = getattr(random_state, distribution)(size=2000)
+    estimator = P2QuantileEstimator(prob=prob)
+    for value in values:
+        estimator.add(float(value))
+    assert len(estimator) == values.size
+    expected = np.quantile(values, prob)
+    tolerance = 0.05 * (np.quantile(values, 0.95) - np.quantile(values, 0.05))
+    assert abs(estimator.quantile() - expected) < tolerance
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_non_finite_values_are_rejected(value):
+    estimator = P2QuantileEstimator(prob=0.5)
+    estimator.add(1.0)
+    with pytest.raises(AssertionError):
+        estimator.add(value)
+    assert len(estimator) == 1
+    assert estimator.quantile() == 1.0
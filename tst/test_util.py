@@ -0,0 +1,104 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import re
+import time
+
+import numpy as np
+import pytest
+
+from syne_tune.util import (
+    RegularCallback,
+    catchtime,
+    is_increasing,
+    is_positive_integer,
+    name_batch_from_base,
+    name_from_base,
+    random_string,
+)
+
+
+def test_regular_callback_sub_second_frequency():
+    calls = []
+    callback = RegularCallback(
+        callback=lambda x: calls.append(x), call_seconds_frequency=0.05
+    )
+    callback(0)
+    assert calls == []
+    time.sleep(0.1)
+    callback(1)
+    callback(2)
+    assert calls == [1]
+
+
+@pytest.mark.parametrize(
+    "lst, expected",
+    [
+        ([], True),
+        ([1], True),
+        ([1, 2, 5], True),
+        ((1.0, 2.5, 3.0), True),
+        (np.array([1, 2, 3]), True),
+        ([1, 1, 2], False),
+        ([3, 2, 1], False),
+    ],
+)
+def test_is_increasing(lst, expected):
+    assert is_increasing(lst) == expected
+
+
+@pytest.mark.parametrize(
+    "lst, expected",
+    [
+        ([], True),
+        ([1, 2, 3], True),
+        ([2.0, np.int64(3)], True),
+        ([0, 1], False),
+        ([1, 2.5], False),
+        ([-1], False),
+    ],
+)
+def test_is_positive_integer(lst, expected):
+    assert is_positive_integer(lst) == expected
+
+
+def test_random_string():
+    for length in [0, 1, 10]:
+        name = random_string(length)
+        assert len(name) == length
+        assert name.isalnum() or length == 0
+
+
+def test_name_from_base():
+    name = name_from_base("my-tuner", default="default")
+    # Timestamp has format ``%Y-%m-%d-%H-%M-%S-<ms>``, with 3 digits for ms
+    assert re.match(r"^my-tuner-\d{4}(-\d{2}){5}-\d{3}$", name)
+    assert name_from_base(None, default="default").startswith("default-")
+    assert len(name_from_base("a" * 60, default="default")) == 63
+
+
+def test_name_batch_from_base():
+    names = name_batch_from_base("a" * 60, default="default", num_names=12)
+    assert len(names) == 12
+    assert len(set(names)) == 12
+    assert all(len(name) <= 63 for name in names)
+    assert names[0][:-2] == names[1][:-2]
+    assert names[11].endswith("-11")
+
+
+def test_catchtime_runtime_dict(capsys):
+    runtime_dict = dict()
+    with catchtime("block", runtime_dict=runtime_dict, verbose=False) as elapsed:
+        time.sleep(0.01)
+        assert elapsed() > 0
+    assert runtime_dict["block"] >= 0.01
+    assert capsys.readouterr().out == ""